@@ -2,28 +2,155 @@ import os
 import pygame
 from .game_tester import GameTester
 
+# GameTesters já iniciados neste processo, por (headless, fps). Criar o JKGame
+# é caro, então agentes com a mesma configuração compartilham a mesma instância.
+_testers_compartilhados = {}
+# Quantos agentes ainda usam cada tester compartilhado
+_usuarios_testers = {}
+
+# Fase de voo de executar_teste_pulo
+LIMITE_ESPERA = 600       # Segurança para não travar se cair no infinito
+QUADROS_PARADO = 10       # Quadros seguidos sem se mover para considerar o rei travado
+Y_MAXIMO = 360            # Maior y válido (mesmo limite de GameTester._validate_y_coordinate)
+
+
+def _obter_tester(headless, fps):
+    """
+    Devolve o GameTester compartilhado para a configuração, criando-o se preciso.
+    """
+    chave = (headless, fps)
+    tester = _testers_compartilhados.get(chave)
+    if tester is None or not tester._initialized:
+        tester = GameTester(headless=headless, fps=fps)
+        _testers_compartilhados[chave] = tester
+        _usuarios_testers[chave] = 0
+    _usuarios_testers[chave] += 1
+    return tester
+
+
+def _liberar_tester(headless, fps):
+    """
+    Libera um uso do GameTester compartilhado; o último a liberar finaliza o jogo.
+    """
+    chave = (headless, fps)
+    _usuarios_testers[chave] -= 1
+    if _usuarios_testers[chave] == 0:
+        del _usuarios_testers[chave]
+        _testers_compartilhados.pop(chave).shutdown()
+
+
+def _pousou(king):
+    """
+    Critério de pouso original: não está caindo, não está pulando e velocidade é zero.
+    """
+    return not king.isFalling and not king.isJump and king.speed == 0 and king.isLanded == False
+
+
+def _criterio_fim_voo(king):
+    """
+    Cria o critério de parada da fase de voo, partindo da posição atual do rei.
+
+    Além do pouso, encerra o voo quando o rei sai da área válida da tela
+    (não vai mais pousar) ou fica QUADROS_PARADO quadros sem se mover (travado).
+    """
+    ultimo_x, ultimo_y = king.x, king.y
+    parado = 0
+
+    def voo_terminou(king):
+        nonlocal ultimo_x, ultimo_y, parado
+
+        if _pousou(king):
+            return True
+
+        # Saiu da área válida da tela: não vai pousar
+        if king.y > Y_MAXIMO:
+            return True
+
+        # Travado: mesma posição por vários quadros seguidos
+        if abs(king.x - ultimo_x) < 0.01 and abs(king.y - ultimo_y) < 0.01:
+            parado += 1
+        else:
+            parado = 0
+        ultimo_x, ultimo_y = king.x, king.y
+        return parado >= QUADROS_PARADO
+
+    return voo_terminou
+
+
 class AgenteTeste:
-    def __init__(self, headless=False, fps=60):
+    def __init__(self, headless=False, fps=60, renderizar=None):
         """
         Initialize the test agent using GameTester.
+        Agents created with the same headless/fps share one game instance.
+            - renderizar: desenha os quadros dos saltos (None: apenas fora do modo headless)
         """
-        self.tester = GameTester(headless=headless, fps=fps)
-    def definir_estado_inicial(self, nivel, x, y):
+        self.tester = _obter_tester(headless, fps)
+        self._configuracao = (headless, fps)
+        self._encerrado = False
+        self.renderizar = renderizar
+
+        # Saltos já simulados:
+        # (estado completo antes do salto, direcao, carga) -> (resultado, estado final)
+        self._cache = {}
+
+    def definir_estado_inicial(self, nivel, x, y, validar=True):
         """
         Set the initial state of the game using GameTester.
         Input: Nível (int), X (float), Y (float)
+            - validar: com False, pula a validação dos parâmetros; use apenas
+              quando os valores já foram validados antes (laços internos)
+        """
+        self.tester.setup(level=nivel, player_x=x, player_y=y, validate=validar)
+
+    def encerrar(self):
+        """
+        Libera o jogo usado pelo agente.
+        Como o jogo é compartilhado, ele só é finalizado quando o último agente
+        com a mesma configuração for encerrado. Chamadas repetidas não têm efeito.
+        """
+        if self._encerrado:
+            return
+        self._encerrado = True
+        # O tester pode ter sido substituído no registro (ex.: finalizado por
+        # fora e recriado); nesse caso este agente não conta mais como usuário
+        if _testers_compartilhados.get(self._configuracao) is self.tester:
+            _liberar_tester(*self._configuracao)
+
+    def capturar_estado(self):
         """
-        self.tester.setup(level=nivel, player_x=x, player_y=y)
+        Captura o estado atual do jogo (rei, nível e vento).
+        Output: estado a ser passado para restaurar_estado
+        """
+        return self.tester.snapshot()
 
-    def executar_teste_pulo(self, direcao, frames_carga):
+    def restaurar_estado(self, estado):
+        """
+        Volta o jogo a um estado capturado com capturar_estado, sem refazer o setup.
+        """
+        self.tester.restore(estado)
+
+    def executar_teste_pulo(self, direcao, frames_carga, usar_cache=True):
         """
         Execute a controlled jump.
         Input: 
             - direcao: 'direita' ou 'esquerda'
             - frames_carga: quantos frames (ticks) segurar o botão de pulo
+            - usar_cache: devolve o resultado já conhecido de um salto idêntico
+              (mesmo estado completo do jogo, direção e carga) sem simular de
+              novo. Nesse caso o jogo é restaurado exatamente para o estado em
+              que o salto original terminou.
         Output:
-            - (nivel_final, x_final, y_final)
+            - (nivel_final, x_final, y_final), com as coordenadas arredondadas
+              para pixels inteiros
         """
+        king = self.tester.game.king
+        chave = (self.tester.state_key(), direcao, frames_carga)
+        if usar_cache and chave in self._cache:
+            resultado, estado_final = self._cache[chave]
+            # Deixa o jogo exatamente como o salto simulado o deixou
+            self.tester.restore(estado_final)
+            return resultado
+
         # Mapeamento baseado no get_action_dict do King.py
         if direcao == 'direita':
             cmd_carga = 2  # Direita + Espaço
@@ -33,39 +160,42 @@ class AgenteTeste:
             cmd_solta = 1  # Esquerda (sem espaço)
 
         # 1. Fase de Carga (Segurar botão)
-        self.tester.step(frames=frames_carga, action=cmd_carga)
+        self.tester.step(frames=frames_carga, action=cmd_carga, render=self.renderizar)
 
         # 2. Fase de Voo (Soltar botão e esperar pousar)
         # Rodamos frames até o rei parar de cair e parar de se mover
-        limite_espera = 600 # Segurança para não travar se cair no infinito
+        self.tester.step_until(
+            _criterio_fim_voo(king),
+            max_frames=LIMITE_ESPERA,
+            action=cmd_solta,
+            render=self.renderizar,
+        )
 
-        while limite_espera > 0:
-            self.tester.step(frames=1, action=cmd_solta)
-            king = self.tester.game.king
-
-            # Critério de parada: Não está caindo, não está pulando e velocidade é zero
-            if not king.isFalling and not king.isJump and king.speed == 0 and king.isLanded == False:
-                break
-
-            limite_espera -= 1
-
-        return (self.tester.get_current_level(), *self.tester.get_player_position())
+        resultado = (self.tester.get_current_level(), *self.tester.get_player_position(as_int=True))
+        self._cache[chave] = (resultado, self.tester.snapshot())
+        return resultado
 
     def verificar_determinismo(self, nivel, x, y, direcao, carga, repeticoes=3):
         """
         Roda o MESMO teste várias vezes para ver se o resultado muda.
+        Para na primeira repetição que divergir da primeira, pois o veredito já é conhecido.
         """
-        resultados = []
+        primeiro = None
+        eh_deterministico = True
         print(f"\n--- Testando Determinismo: Carga {carga} p/ {direcao} ---")
 
         for i in range(repeticoes):
             self.definir_estado_inicial(nivel, x, y)
-            resultado = self.executar_teste_pulo(direcao, carga)
-            resultados.append(resultado)
+            # Sem cache: cada repetição precisa ser de fato simulada
+            resultado = self.executar_teste_pulo(direcao, carga, usar_cache=False)
             print(f"Teste {i+1}: Posição Final {resultado}")
 
-        # Verifica se todos os resultados são idênticos
-        eh_deterministico = all(r == resultados[0] for r in resultados)
+            # Verifica se o resultado é idêntico ao da primeira repetição
+            if primeiro is None:
+                primeiro = resultado
+            elif resultado != primeiro:
+                eh_deterministico = False
+                break
 
         if eh_deterministico:
             print("Resultado: DETERMINÍSTICO")
@@ -1,27 +1,230 @@
 import sys
 import os
 import math
+import glob
+import pickle
+import hashlib
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 
 # Garante que o Python encontre os módulos na pasta raiz
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from .AgenteTeste import AgenteTeste
 
+# Agente próprio de cada processo trabalhador, criado uma única vez no initializer
+_agente_worker = None
+
+
+def _inicializar_worker():
+    """
+    Cria o AgenteTeste do processo trabalhador (o jogo é iniciado uma vez por processo).
+    """
+    global _agente_worker
+    _agente_worker = AgenteTeste(headless=True, fps=10000)
+
+
+def _testar_lote(agente, nivel_id, start_y, tarefas):
+    """
+    Executa uma sequência de saltos com o agente informado.
+
+    O setup completo roda uma vez por posição; os saltos seguintes na mesma
+    posição apenas restauram o estado capturado logo após o posicionamento.
+
+    Yields:
+        tuple: (pos_x, carga, direcao, (nivel_final, x_final, y_final))
+    """
+    pos_atual = None
+    for pos_x, carga, direcao in tarefas:
+        # 1. Posiciona
+        if pos_x != pos_atual:
+            # As posições já foram validadas por mapear_plataforma
+            agente.definir_estado_inicial(nivel_id, float(pos_x), float(start_y), validar=False)
+            estado_inicial = agente.capturar_estado()
+            pos_atual = pos_x
+        else:
+            agente.restaurar_estado(estado_inicial)
+
+        # 2. Pula
+        yield pos_x, carga, direcao, agente.executar_teste_pulo(direcao, carga)
+
+
+# Layout compacto de um resultado de mapeamento (direção: +1 direita, -1 esquerda)
+DTYPE_RESULTADO = np.dtype([
+    ('pos_x', 'i4'),
+    ('carga', 'i4'),
+    ('direcao', 'i1'),
+    ('nivel', 'i4'),
+    ('x', 'i4'),
+    ('y', 'i4'),
+])
+
+
+def resultados_para_array(resultados):
+    """
+    Converte o dicionário de mapear_plataforma em um array estruturado do NumPy.
+
+    Cada salto vira uma linha contígua de DTYPE_RESULTADO, bem mais compacta que
+    o par chave/tupla do dicionário e adequada a filtros vetorizados, por exemplo
+    arr[arr['nivel'] > 0].
+
+    Args:
+        resultados (dict): { (pos_x, carga, direcao): (nivel_final, x_final, y_final) }
+
+    Returns:
+        np.ndarray: Array com um registro por salto, na ordem do dicionário.
+    """
+    return np.fromiter(
+        (
+            (pos_x, carga, 1 if direcao == 'direita' else -1, nivel, x, y)
+            for (pos_x, carga, direcao), (nivel, x, y) in resultados.items()
+        ),
+        dtype=DTYPE_RESULTADO,
+        count=len(resultados),
+    )
+
+
+def _versao_simulador():
+    """
+    Identifica a versão do código que produz os saltos (este pacote e o jogo).
+
+    Combina caminho, tamanho e data de modificação de cada arquivo-fonte, de
+    modo que qualquer alteração no simulador invalide o cache em disco.
+    """
+    pasta = os.path.dirname(os.path.abspath(__file__))
+    fontes = [
+        os.path.join(pasta, nome)
+        for nome in ('AgenteTeste.py', 'game_tester.py', 'ExploradorPlataforma.py')
+    ]
+    fontes += glob.glob(os.path.join(pasta, '..', 'JumpKingAtHome', '*.py'))
+
+    assinatura = hashlib.sha1()
+    for fonte in sorted(fontes):
+        info = os.stat(fonte)
+        assinatura.update(f"{os.path.basename(fonte)}:{info.st_size}:{info.st_mtime_ns};".encode())
+    return assinatura.hexdigest()[:12]
+
+
+def _testar_lote_worker(nivel_id, start_y, tarefas):
+    """
+    Executa um lote de saltos no processo trabalhador.
+    """
+    return list(_testar_lote(_agente_worker, nivel_id, start_y, tarefas))
+
+
 class ExploradorPlataforma:
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, processos=1, diretorio_cache=None):
         """
         Inicializa o AgenteTeste.
+
+        Args:
+            headless (bool): Executa o jogo sem janela.
+            processos (int): Número de processos usados no mapeamento. Com mais de
+                um processo, os saltos são divididos entre trabalhadores iniciados
+                do zero (spawn), cada um com sua própria instância headless do
+                jogo. None usa um processo por núcleo da máquina.
+            diretorio_cache (str): Se informado, os mapeamentos também são salvos
+                em disco nesse diretório e reaproveitados entre execuções. O cache
+                é invalidado sempre que o código do simulador muda.
         """
-        # Configura para modo headless e FPS alto para máxima velocidade
-        self.agente = AgenteTeste(headless=headless, fps=10000)
+        # Configura FPS alto para máxima velocidade; os saltos da varredura não
+        # são desenhados mesmo com janela, só a lógica do jogo importa aqui
+        self.agente = AgenteTeste(headless=headless, fps=10000, renderizar=False)
+        
+        self.processos = processos if processos is not None else (os.cpu_count() or 1)
+        self._pool = None
+        
+        # Mapeamentos já feitos: (nivel_id, plataforma_params) -> resultados
+        self._mapeamentos = {}
+        self.diretorio_cache = diretorio_cache
         
         # Ajuste vertical para o Rei ficar exatamente sobre a plataforma.
         self.king_feet_offset = 31 
 
+    def _executar_paralelo(self, nivel_id, start_y, tarefas):
+        """
+        Divide os saltos em lotes contíguos e os distribui entre os processos.
+
+        Os resultados são devolvidos na mesma ordem das tarefas.
+        """
+        if self._pool is None:
+            # "spawn" em vez do fork padrão no Linux: este processo já iniciou o
+            # pygame/SDL (com threads próprias) e o registro de testers, e um
+            # filho copiado por fork herdaria ambos, reaproveitando o jogo e a
+            # janela do pai em vez de criar seu próprio jogo headless
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.processos,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_inicializar_worker,
+            )
+
+        # Alguns lotes por processo para equilibrar a carga entre eles
+        tamanho = math.ceil(len(tarefas) / (self.processos * 4))
+        lotes = [tarefas[i:i + tamanho] for i in range(0, len(tarefas), tamanho)]
+
+        futuros = [
+            self._pool.submit(_testar_lote_worker, nivel_id, start_y, lote)
+            for lote in lotes
+        ]
+        for futuro in futuros:
+            yield from futuro.result()
+
+    def encerrar(self):
+        """
+        Finaliza os processos trabalhadores, se existirem, e o jogo do agente.
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self.agente.encerrar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.encerrar()
+
+    def _arquivo_cache(self, chave):
+        """
+        Caminho do arquivo de cache em disco para um mapeamento.
+        """
+        nome = hashlib.sha1(repr(chave).encode()).hexdigest()
+        return os.path.join(self.diretorio_cache, _versao_simulador(), f"{nome}.pkl")
+
+    def _salvar_cache(self, arquivo, resultados):
+        """
+        Grava um mapeamento no cache em disco de forma atômica.
+
+        O pickle é escrito num arquivo temporário da mesma pasta e só então
+        movido para o lugar, para que uma execução interrompida (ou concorrente)
+        nunca deixe um .pkl truncado para a próxima leitura.
+        """
+        pasta = os.path.dirname(arquivo)
+        os.makedirs(pasta, exist_ok=True)
+        with tempfile.NamedTemporaryFile('wb', dir=pasta, suffix='.tmp', delete=False) as f:
+            temporario = f.name
+            try:
+                pickle.dump(resultados, f)
+            except BaseException:
+                f.close()
+                os.remove(temporario)
+                raise
+        os.replace(temporario, arquivo)
+
     def mapear_plataforma(self, nivel_id, plataforma_params):
         """
         Explora saltos a partir de uma plataforma usando amostragem de pontos.
 
+        O jogo nunca é finalizado aqui: chamadas seguintes reaproveitam a mesma
+        instância, apenas reposicionando o rei.
+
+        Como o jogo é determinístico, o resultado de cada plataforma é guardado
+        e devolvido diretamente se ela for mapeada de novo (e, com
+        diretorio_cache, também entre execuções).
+
         Args:
             nivel_id (int): O ID do nível onde a plataforma está.
             plataforma_params (tuple): (x, y, w, h, slope, slip, support, snow)
@@ -29,6 +232,30 @@ class ExploradorPlataforma:
         Returns:
             dict: { (pos_x, carga, direcao): (nivel_final, x_final, y_final) }
         """
+        chave = (nivel_id, tuple(plataforma_params))
+
+        resultados = self._mapeamentos.get(chave)
+        if resultados is None and self.diretorio_cache is not None:
+            arquivo = self._arquivo_cache(chave)
+            if os.path.exists(arquivo):
+                with open(arquivo, 'rb') as f:
+                    resultados = pickle.load(f)
+
+        if resultados is not None:
+            print(f"\n--- Mapeamento em cache: {len(resultados)} testes ---")
+        else:
+            resultados = self._mapear(nivel_id, plataforma_params)
+            if self.diretorio_cache is not None:
+                self._salvar_cache(self._arquivo_cache(chave), resultados)
+
+        self._mapeamentos[chave] = resultados
+        # Cópia, para que alterações do chamador não corrompam o cache
+        return dict(resultados)
+
+    def _mapear(self, nivel_id, plataforma_params):
+        """
+        Executa de fato a varredura de mapear_plataforma.
+        """
         # Desempacota os parâmetros
         px, py, pw, ph, slope, slip, support, snow = plataforma_params
         
@@ -47,46 +274,66 @@ class ExploradorPlataforma:
         if pw < num_amostras:
             pontos_teste = list(range(start_x, end_x + 1))
         else:
-            pontos_teste = []
-            step = pw / (num_amostras - 1)
-            for i in range(num_amostras):
-                ponto = int(start_x + (i * step))
-                # Garante que não ultrapasse o limite da plataforma
-                if ponto > end_x: 
-                    ponto = end_x
-                pontos_teste.append(ponto)
-            
-            # Remove duplicatas e ordena (por segurança em arredondamentos)
-            pontos_teste = sorted(list(set(pontos_teste)))
+            # Pontos igualmente espaçados entre as bordas (inclusive), truncados para
+            # pixels inteiros; np.unique remove duplicatas e já devolve ordenado
+            pontos = np.linspace(start_x, end_x, num_amostras).astype(np.int64)
+            pontos_teste = np.unique(pontos).tolist()
 
         print(f"\n--- Iniciando Mapeamento Otimizado ---")
         print(f"Plataforma: ({px}, {py}) | Largura: {pw}")
         print(f"Pontos de teste selecionados ({len(pontos_teste)}): {pontos_teste}")
 
-        # Loop pelos pontos selecionados
-        for pos_x in pontos_teste:
+        # Validação única: todos os pontos ficam entre as duas bordas, então
+        # validá-las cobre a varredura inteira, que pode pular a validação
+        for borda in (pontos_teste[0], pontos_teste[-1]):
+            self.agente.definir_estado_inicial(nivel_id, float(borda), float(start_y))
+
+        # Combinações (posição, carga 0 a 35 frames, direção)
+        tarefas = [
+            (pos_x, carga, direcao)
+            for pos_x in pontos_teste
+            for carga in range(36)
+            for direcao in ['direita', 'esquerda']
+        ]
+
+        if self.processos > 1:
+            saltos = self._executar_paralelo(nivel_id, start_y, tarefas)
+        else:
+            saltos = _testar_lote(self.agente, nivel_id, start_y, tarefas)
+
+        pos_atual = None
+        for pos_x, carga, direcao, resultado in saltos:
+            
+            if pos_x != pos_atual:
+                pos_atual = pos_x
+                print(f"\n--> Testando Posição X: {pos_x}")
             
-            print(f"\n--> Testando Posição X: {pos_x}")
+            # 3. Notifica (Print solicitado)
+            # Formato: [Carga] Direção -> Resultado Final
+            print(f"   [{carga:02d}f] {direcao[:3].upper()} -> Pousou em {resultado}")
             
-            # Loop de Carga: 0 a 35 frames
-            for carga in range(36):
-                
-                for direcao in ['direita', 'esquerda']:
-                    
-                    # 1. Posiciona
-                    self.agente.definir_estado_inicial(nivel_id, float(pos_x), float(start_y))
-                    
-                    # 2. Pula
-                    resultado = self.agente.executar_teste_pulo(direcao, carga)
-                    
-                    # 3. Notifica (Print solicitado)
-                    # Formato: [Carga] Direção -> Resultado Final
-                    print(f"   [{carga:02d}f] {direcao[:3].upper()} -> Pousou em {resultado}")
-                    
-                    # 4. Salva
-                    chave = (pos_x, carga, direcao)
-                    resultados[chave] = resultado
+            # 4. Salva
+            chave = (pos_x, carga, direcao)
+            resultados[chave] = resultado
 
         print(f"\n--- Mapeamento Concluído ---")
         print(f"Total de testes realizados: {len(resultados)}")
-        return resultados
\ No newline at end of file
+        return resultados
+
+    def mapear_plataformas(self, plataformas):
+        """
+        Mapeia várias plataformas em uma única sessão do jogo.
+
+        Entre uma plataforma e outra o rei é apenas teleportado para o novo nível
+        e posição; o pygame e o JKGame não são reiniciados.
+
+        Args:
+            plataformas (list): Pares (nivel_id, plataforma_params).
+
+        Returns:
+            dict: { (nivel_id, plataforma_params): resultado de mapear_plataforma }
+        """
+        return {
+            (nivel_id, tuple(params)): self.mapear_plataforma(nivel_id, params)
+            for nivel_id, params in plataformas
+        }
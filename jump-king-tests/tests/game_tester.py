@@ -12,6 +12,56 @@ import math
 import pygame
 
 
+# SDL drivers chosen by the user before any GameTester touched them. Headful
+# testers restore these instead of clearing them, so an externally forced
+# SDL_VIDEODRIVER=dummy (e.g. for fast CI runs) is honored even when headless=False.
+_USER_SDL_DRIVERS = {
+    name: os.environ.get(name) for name in ("SDL_VIDEODRIVER", "SDL_AUDIODRIVER")
+}
+
+
+def _copy_state_value(value):
+    """
+    Copy a King attribute value so in-place changes to the game do not reach it.
+    
+    pygame Rects and plain containers (lists, dicts, sets) are copied, recursively
+    for nested containers; any other object (sprites, surfaces, level and game
+    references) is shared with the game and kept by reference.
+    """
+    if isinstance(value, pygame.Rect):
+        return value.copy()
+    if isinstance(value, list):
+        return [_copy_state_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _copy_state_value(item) for key, item in value.items()}
+    if isinstance(value, set):
+        return set(value)
+    return value
+
+
+def _freeze_state_value(value):
+    """
+    Hashable stand-in for a King attribute value, used to compare states.
+    
+    Rects and containers are compared by content; any other object is used
+    as is when hashable (shared game objects then compare by identity) and by
+    identity otherwise.
+    """
+    if isinstance(value, pygame.Rect):
+        return tuple(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze_state_value(item) for item in value)
+    if isinstance(value, dict):
+        return tuple((key, _freeze_state_value(item)) for key, item in value.items())
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    try:
+        hash(value)
+    except TypeError:
+        return ("id", id(value))
+    return value
+
+
 class GameTester:
     """
     A test utility class that provides complete control over the JumpKing game state.
@@ -27,30 +77,59 @@ class GameTester:
     Can be used as a context manager for automatic resource cleanup.
     """
     
-    def __init__(self, headless: bool = False, fps: int = 60):
+    def __init__(
+        self,
+        headless: bool = False,
+        fps: int = 60,
+        render_every_n: int = 1,
+        pump_events: bool = False
+    ):
         """
         Initialize the GameTester and launch the JumpKing game.
         
         Args:
             headless: If True, run pygame in headless mode for CI/CD environments.
-                     Uses SDL_VIDEODRIVER=dummy to avoid display requirements.
+                     Uses SDL_VIDEODRIVER=dummy to avoid display requirements
+                     and SDL_AUDIODRIVER=dummy so no audio device is opened.
+                     Nothing is drawn while stepping in this mode.
+                     The video driver in use is stored in `video_driver`.
             fps: Target frame rate for game execution (default: 60)
+            render_every_n: When not headless, draw only after at least N frames
+                     were simulated since the last drawn frame (default: 1)
+            pump_events: Let the window process OS events each time a frame is
+                     drawn, so it stays responsive while an operator watches
+                     (default: False). Game input is never read either way.
             
         Raises:
+            ValueError: If render_every_n is less than 1
             RuntimeError: If game initialization fails
         """
+        if render_every_n < 1:
+            raise ValueError(f"Invalid render_every_n: {render_every_n}. Must be >= 1")
+        
         self._initialized = False
         self.headless = headless
         self.fps = fps
+        self.render_every_n = render_every_n
+        self.pump_events = pump_events
+        self._frames_since_render = 0
+        self._log = []
         self.game = None
+        self.video_driver = None
         
         try:
             # Set headless mode BEFORE any pygame operations
             if headless:
                 os.environ["SDL_VIDEODRIVER"] = "dummy"
+                os.environ["SDL_AUDIODRIVER"] = "dummy"
             else:
-                # Ensure we're NOT in headless mode if headless=False
-                os.environ.pop("SDL_VIDEODRIVER", None)
+                # Ensure we're NOT in headless mode if headless=False, undoing any
+                # dummy drivers set by a previous headless tester
+                for name, value in _USER_SDL_DRIVERS.items():
+                    if value is None:
+                        os.environ.pop(name, None)
+                    else:
+                        os.environ[name] = value
             
             # Configure environment variables before game initialization
             self._configure_environment(fps, headless)
@@ -58,6 +137,9 @@ class GameTester:
             # Import and initialize the game
             self._initialize_game()
             
+            # Record which video driver SDL actually picked (e.g. "x11", "dummy")
+            self.video_driver = pygame.display.get_driver()
+            
             self._initialized = True
         except Exception as e:
             self.shutdown()
@@ -133,6 +215,12 @@ class GameTester:
             self.game.fps = self.fps
             os.environ["fps"] = str(self.fps)
             
+            # Nobody looks at the window in headless mode: if anything still draws
+            # the frame, it is scaled into a 1x1 off-screen surface instead of a
+            # full-size display buffer
+            if self.headless:
+                self.game.screen = pygame.Surface((1, 1))
+            
         except ImportError as e:
             raise ImportError(f"Failed to import JumpKing module: {e}") from e
         except Exception as e:
@@ -233,19 +321,31 @@ class GameTester:
         # Validate coordinates using helper methods
         self._validate_coordinates(x, y)
         
+        self._place_player(x, y)
+    
+    def _place_player(self, x: float, y: float) -> None:
+        """
+        Write the player position and reset physics state, without validation.
+        
+        Args:
+            x: Player x coordinate
+            y: Player y coordinate
+        """
+        king = self.game.king
+        
         # Set player position
         # Account for rect offsets used by the game
-        self.game.king.x = x
-        self.game.king.y = y
-        self.game.king.rect_x = x + 1
-        self.game.king.rect_y = y + 7
+        king.x = x
+        king.y = y
+        king.rect_x = x + 1
+        king.rect_y = y + 7
         
         # Reset physics state for stability
-        self.game.king.speed = 0
-        self.game.king.angle = 0
-        self.game.king.isFalling = False
-        self.game.king.isSplat = False
-        self.game.king.lastCollision = None
+        king.speed = 0
+        king.angle = 0
+        king.isFalling = False
+        king.isSplat = False
+        king.lastCollision = None
     
     def set_level(self, level: int) -> None:
         """
@@ -289,21 +389,33 @@ class GameTester:
         # Validate wind phase using helper method
         self._validate_wind_phase(wind_phase)
         
+        self._apply_wind(wind_phase)
+    
+    def _apply_wind(self, wind_phase: float) -> None:
+        """
+        Write the wind phase and matching displacement, without validation.
+        
+        Args:
+            wind_phase: Wind phase value
+        """
+        wind = self.game.levels.wind
+        
         # Set wind phase
-        self.game.levels.wind.wind_var = wind_phase
+        wind.wind_var = wind_phase
         
         # Recalculate wind.x to match the new phase
         # The wind displacement is the integral of sin(wind_var) * 6.25
         # Integral of sin(x) is -cos(x), so we use -cos(wind_var) * 6.25
         # This keeps the visual weather effect synchronized with the wind phase
-        self.game.levels.wind.x = -math.cos(wind_phase) * (2.5 ** 2)
+        wind.x = -math.cos(wind_phase) * (2.5 ** 2)
     
     def setup(
         self,
         level: int = 0,
         player_x: float = 230.0,
         player_y: float = 298.0,
-        wind_phase: float = 0.0
+        wind_phase: float = 0.0,
+        validate: bool = True
     ) -> None:
         """
         Configure the complete game environment in a single call.
@@ -317,6 +429,9 @@ class GameTester:
             player_x: Player x coordinate (default: 230.0, valid range: 0-480)
             player_y: Player y coordinate (default: 298.0, valid range: 0-360)
             wind_phase: Wind phase value (default: 0.0, valid range: 0.0 to 2π)
+            validate: If False, skip parameter validation and the playable-state
+                     check. Only for trusted callers in tight loops that have
+                     already validated their inputs (default: True)
             
         Raises:
             ValueError: If any parameter is outside valid range
@@ -325,6 +440,10 @@ class GameTester:
         if not self._initialized or self.game is None:
             raise RuntimeError("GameTester is not initialized")
         
+        if not validate:
+            self._setup_unchecked(level, player_x, player_y, wind_phase)
+            return
+        
         # Apply configuration in correct order
         self.set_level(level)
         self.set_player_position(player_x, player_y)
@@ -333,6 +452,135 @@ class GameTester:
         # Verify game is in playable state
         self._ensure_playable_state()
     
+    def reset_state(
+        self,
+        level: int = 0,
+        player_pos: tuple = None,
+        wind_phase: float = 0.0
+    ) -> None:
+        """
+        Rewind the game to a clean state without restarting pygame.
+        
+        Unpauses the game and applies setup() with the given parameters, so a
+        single GameTester (and its window) can be reused across many tests.
+        
+        Args:
+            level: Level identifier (default: 0, valid range: 0-42)
+            player_pos: Player (x, y) coordinates (default: None, meaning the
+                       standard start position used by setup())
+            wind_phase: Wind phase value (default: 0.0, valid range: 0.0 to 2π)
+            
+        Raises:
+            ValueError: If any parameter is outside valid range
+            RuntimeError: If game is not initialized
+        """
+        if not self._initialized or self.game is None:
+            raise RuntimeError("GameTester is not initialized")
+        
+        self.set_paused(False)
+        if player_pos is None:
+            self.setup(level=level, wind_phase=wind_phase)
+        else:
+            player_x, player_y = player_pos
+            self.setup(level=level, player_x=player_x, player_y=player_y, wind_phase=wind_phase)
+    
+    def _setup_unchecked(
+        self,
+        level: int,
+        player_x: float,
+        player_y: float,
+        wind_phase: float = 0.0
+    ) -> None:
+        """
+        Apply a full setup without validation or playable-state checks.
+        
+        Args:
+            level: Level identifier
+            player_x: Player x coordinate
+            player_y: Player y coordinate
+            wind_phase: Wind phase value (default: 0.0)
+        """
+        self.game.levels.current_level = level
+        self._place_player(player_x, player_y)
+        self._apply_wind(wind_phase)
+    
+    def snapshot(self) -> dict:
+        """
+        Capture the current King, level and wind state.
+        
+        The King's scalar physics state (position, speed, angle, jump flags) is
+        preserved, and its mutable values (pygame Rects and containers) are
+        copied, so anything the game changes in place while stepping is rolled
+        back by restore(). Shared objects such as sprites and level references
+        are kept by reference. Unlike setup(), which only places the King and
+        resets its core physics fields, restore() brings back every King
+        attribute, so a restored game continues exactly like the captured one.
+        
+        Returns:
+            A dictionary with the captured state, to be passed to restore()
+            
+        Raises:
+            RuntimeError: If game is not initialized
+        """
+        if not self._initialized or self.game is None:
+            raise RuntimeError("GameTester is not initialized")
+        
+        wind = self.game.levels.wind
+        return {
+            "king": _copy_state_value(self.game.king.__dict__),
+            "level": self.game.levels.current_level,
+            "wind_var": wind.wind_var,
+            "wind_x": wind.x,
+        }
+    
+    def state_key(self) -> tuple:
+        """
+        Build a hashable key of the current King, level and wind state.
+        
+        Covers every King attribute, not only the position, so two states
+        with equal keys evolve identically under the same actions. Useful to
+        memoize simulations per starting state.
+        
+        Returns:
+            A tuple that compares equal for identical states
+            
+        Raises:
+            RuntimeError: If game is not initialized
+        """
+        if not self._initialized or self.game is None:
+            raise RuntimeError("GameTester is not initialized")
+        
+        wind = self.game.levels.wind
+        return (
+            self.game.levels.current_level,
+            wind.wind_var,
+            wind.x,
+            _freeze_state_value(self.game.king.__dict__),
+        )
+    
+    def restore(self, snap: dict) -> None:
+        """
+        Restore a state previously captured with snapshot().
+        
+        No validation is performed since the values came from a valid game state.
+        The snapshot is copied again on the way in, so it can be restored any
+        number of times.
+        
+        Args:
+            snap: Dictionary returned by snapshot()
+            
+        Raises:
+            RuntimeError: If game is not initialized
+        """
+        if not self._initialized or self.game is None:
+            raise RuntimeError("GameTester is not initialized")
+        
+        self.game.king.__dict__.update(_copy_state_value(snap["king"]))
+        self.game.levels.current_level = snap["level"]
+        wind = self.game.levels.wind
+        wind.wind_var = snap["wind_var"]
+        wind.x = snap["wind_x"]
+    
     def _ensure_playable_state(self) -> None:
         """
         Internal method to verify the game is in a playable state.
@@ -354,10 +602,27 @@ class GameTester:
         if os.environ.get("pause") != "":
             raise RuntimeError("Game is paused")
     
-    def get_player_position(self) -> tuple:
+    def set_paused(self, paused: bool) -> None:
+        """
+        Pause or resume the game logic.
+        
+        While paused, step() still advances frames (and renders them) but the
+        game simulation does not progress.
+        
+        Args:
+            paused: True to pause the game, False to resume it
+        """
+        os.environ["pause"] = "1" if paused else ""
+    
+    def get_player_position(self, as_int: bool = False) -> tuple:
         """
         Get the current player character position.
         
+        Args:
+            as_int: If True, round the coordinates to the nearest integer pixel.
+                   Integer positions compare and hash reliably, which makes them
+                   suitable for comparing outcomes across runs (default: False)
+        
         Returns:
             A tuple of (x, y) coordinates representing the player's position
             
@@ -367,7 +632,10 @@ class GameTester:
         if not self._initialized or self.game is None:
             raise RuntimeError("GameTester is not initialized")
         
-        return (self.game.king.x, self.game.king.y)
+        king = self.game.king
+        if as_int:
+            return (int(round(king.x)), int(round(king.y)))
+        return (king.x, king.y)
     
     def get_current_level(self) -> int:
         """
@@ -420,18 +688,29 @@ class GameTester:
             not self.game.king.isFalling
         )
     
-    def step(self, frames: int = 1, action: int = None) -> None:
+    def step(self, frames: int = 1, action: int = None, render: bool = None) -> None:
         """
         Advance the game simulation by a specified number of frames.
         
         This method advances the game by the specified number of frames,
         running the full game loop including physics, collisions, and rendering.
         Keyboard input is ignored during stepping to allow deterministic testing.
+        Frames are never throttled to the target fps: the simulation runs as
+        fast as the CPU allows.
+        
+        When rendering is off (the default in headless mode) only the game logic
+        runs: screen drawing, GUI updates and the display flush are skipped since
+        nobody observes them. Otherwise only the final frame of the call is drawn
+        (subject to `render_every_n`), since intermediate frames are never
+        observable between step() calls.
         
         Args:
             frames: Number of frames to advance (default: 1)
             action: Optional action command to pass to game logic (default: None).
                    Valid actions: 0='right', 1='left', 2='right+space', 3='left+space'
+            render: Whether to draw the resulting frame (default: None, meaning
+                   draw unless headless). Pass False in loops that only need
+                   game logic to advance, even with a visible window.
             
         Raises:
             RuntimeError: If game is not initialized
@@ -440,17 +719,198 @@ class GameTester:
             raise RuntimeError("GameTester is not initialized")
         
         # Advance frames with full game logic but no keyboard input
+        self._advance(frames, action, render=render)
+    
+    def step_until(
+        self,
+        predicate,
+        max_frames: int,
+        action: int = None,
+        render: bool = None
+    ) -> int:
+        """
+        Advance the game one frame at a time until a condition on the King holds.
+        
+        The condition is checked after every frame inside this single call,
+        so callers waiting for an event (e.g. a landing) do not need to drive
+        a Python loop of step(frames=1) calls themselves.
+        
+        Args:
+            predicate: Callable receiving the King object and returning True
+                      when stepping should stop
+            max_frames: Maximum number of frames to advance
+            action: Optional action command passed to game logic on every frame
+                   (same values as step())
+            render: Whether to draw the final frame (same meaning as in step())
+            
+        Returns:
+            The number of frames advanced (equal to max_frames if the
+            predicate never became true)
+            
+        Raises:
+            RuntimeError: If game is not initialized
+        """
+        if not self._initialized or self.game is None:
+            raise RuntimeError("GameTester is not initialized")
+        
+        return self._advance(max_frames, action, predicate, render)
+    
+    def _advance(
+        self,
+        max_frames: int,
+        action: int,
+        predicate=None,
+        render: bool = None
+    ) -> int:
+        """
+        Run up to max_frames frames of game logic, then draw the last one if due.
+        
+        Args:
+            max_frames: Number of frames to advance
+            action: Optional action command to pass to game logic
+            predicate: Optional callable receiving the King; stops early when true
+            render: Whether to draw the final frame (None: draw unless headless)
+            
+        Returns:
+            The number of frames advanced
+        """
+        # Skip _check_events() to prevent keyboard input from affecting the simulation.
+        # Since no events are processed, the pause flag cannot change while stepping
+        # and is read once per call.
+        paused = bool(os.environ["pause"])
+        update = self.game._update_gamestuff
+        king = self.game.king
+        
+        frames_run = max_frames
+        for frame in range(1, max_frames + 1):
+            if not paused:
+                update(action=action)
+            
+            if predicate is not None and predicate(king):
+                frames_run = frame
+                break
+        
+        if render is None:
+            render = not self.headless
+        if render:
+            self._frames_since_render += frames_run
+            if self._frames_since_render >= self.render_every_n:
+                self._render()
+        return frames_run
+    
+    def _render(self) -> None:
+        """
+        Draw the current game state and flush it to the display.
+        """
+        self.game._update_gamescreen()
+        self.game._update_guistuff()
+        # Skip audio processing in headless mode
+        if not self.headless:
+            self.game._update_audio()
+        pygame.display.update()
+        if self.pump_events:
+            pygame.event.pump()
+        self._frames_since_render = 0
+    
+    def render_states(self, states: list, tile: tuple = (2, 2), frames: int = 60) -> None:
+        """
+        Show several game states side by side in a single display update.
+        
+        Each state is applied with reset_state() and drawn into its own tile of
+        the window, then the composite frame is flushed once and kept on screen
+        for `frames` frames at the target fps. No physics runs in between, so
+        this replaces rendering each state for its own stretch of frames when
+        the states only need to be looked at. The game is left in the last state.
+        
+        In headless mode the states are applied but nothing is drawn or waited for.
+        
+        Args:
+            states: List of dicts with optional keys "level", "player_pos" and
+                   "wind_phase", taking the same values as reset_state()
+            tile: Grid of (columns, rows) the window is divided into (default: (2, 2))
+            frames: How many frames' worth of time to show the composite (default: 60)
+        
+        Raises:
+            ValueError: If there are more states than tiles, or any state
+                       parameter is outside valid range
+            RuntimeError: If game is not initialized
+        """
+        if not self._initialized or self.game is None:
+            raise RuntimeError("GameTester is not initialized")
+        
+        columns, rows = tile
+        if len(states) > columns * rows:
+            raise ValueError(
+                f"Too many states: {len(states)}. A {columns}x{rows} tile holds at most {columns * rows}"
+            )
+        
+        if self.headless:
+            for state in states:
+                self.reset_state(**state)
+            return
+        
+        display = pygame.display.get_surface()
+        width, height = display.get_size()
+        tile_width, tile_height = width // columns, height // rows
+        
+        # The game scales its frame into self.game.screen, so pointing it at a
+        # subsurface of the window draws a shrunken copy into that tile
+        screen = self.game.screen
+        try:
+            for index, state in enumerate(states):
+                self.reset_state(**state)
+                column, row = index % columns, index // columns
+                self.game.screen = display.subsurface(
+                    pygame.Rect(column * tile_width, row * tile_height, tile_width, tile_height)
+                )
+                self.game._update_gamescreen()
+        finally:
+            self.game.screen = screen
+        
+        pygame.display.update()
+        self._frames_since_render = 0
+        self._wait(frames)
+    
+    def hold(self, frames: int = 60) -> None:
+        """
+        Keep the current frame on screen without advancing the simulation.
+        
+        Draws the current state once, then waits `frames` frames at the target
+        fps. Physics, wind and input are all frozen meanwhile, so this is
+        the cheap way to give an operator time to look at a state. Use step()
+        when the test needs the game to actually progress.
+        
+        Does nothing in headless mode.
+        
+        Args:
+            frames: Number of frames to keep the state displayed (default: 60)
+            
+        Raises:
+            RuntimeError: If game is not initialized
+        """
+        if not self._initialized or self.game is None:
+            raise RuntimeError("GameTester is not initialized")
+        
+        if self.headless:
+            return
+        
+        self._render()
+        self._wait(frames)
+    
+    def _wait(self, frames: int) -> None:
+        """
+        Let `frames` frames of wall-clock time pass at the target fps.
+        
+        The window keeps processing OS events meanwhile if pump_events is set.
+        
+        Args:
+            frames: Number of frames to wait
+        """
+        clock = self.game.clock
         for _ in range(frames):
-            # Skip _check_events() to prevent keyboard input from affecting the simulation
-            if not os.environ["pause"]:
-                self.game._update_gamestuff(action=action)
-            
-            self.game._update_gamescreen()
-            self.game._update_guistuff()
-            # Skip audio processing in headless mode
-            if not self.headless:
-                self.game._update_audio()
-            pygame.display.update()
+            clock.tick(self.fps)
+            if self.pump_events:
+                pygame.event.pump()
     
     def run_with_input(self) -> None:
         """
@@ -502,13 +962,35 @@ class GameTester:
             # Restore original working directory
             os.chdir(original_cwd)
     
+    def log(self, message: str) -> None:
+        """
+        Buffer a progress message instead of printing it right away.
+        
+        Buffered messages are written to stdout in one go by flush_log(),
+        which shutdown() also calls.
+        
+        Args:
+            message: Line of text to report
+        """
+        self._log.append(message)
+    
+    def flush_log(self) -> None:
+        """
+        Write all buffered log messages to stdout with a single write.
+        """
+        if self._log:
+            sys.stdout.write("\n".join(self._log) + "\n")
+            self._log.clear()
+    
     def shutdown(self) -> None:
         """
         Clean shutdown of the game instance and pygame resources.
         
-        This method stops all audio channels, quits pygame, and releases
-        all associated resources. Safe to call multiple times.
+        This method writes out buffered log messages, stops all audio channels,
+        quits pygame, and releases all associated resources. Safe to call
+        multiple times.
         """
+        self.flush_log()
         if not self._initialized:
             return
         
@@ -518,8 +1000,8 @@ class GameTester:
                 if hasattr(self.game, 'environment'):
                     self.game.environment.save()
                 
-                # Stop all audio channels
-                if pygame.mixer.get_init():
+                # Stop all audio channels (nothing is ever played in headless mode)
+                if not self.headless and pygame.mixer.get_init():
                     for i in range(pygame.mixer.get_num_channels()):
                         try:
                             pygame.mixer.Channel(i).stop()
@@ -1,5 +1,15 @@
 import unittest
-from .AgenteTeste import AgenteTeste
+from types import SimpleNamespace
+from unittest import mock
+
+from .AgenteTeste import (
+    AgenteTeste,
+    LIMITE_ESPERA,
+    QUADROS_PARADO,
+    Y_MAXIMO,
+    _criterio_fim_voo,
+    _pousou,
+)
 
 class TestAgenteTeste(unittest.TestCase):
 
@@ -48,5 +58,137 @@ class TestAgenteTeste(unittest.TestCase):
         )
         self.assertTrue(resultado, "O teste de pulo máximo para a esquerda não foi determinístico.")
 
+    def test_pulo_repetido_usa_cache(self):
+        """
+        Test that repeating an identical jump returns the cached result.
+        """
+        self.agente.definir_estado_inicial(self.start_lvl, self.start_x, self.start_y)
+        primeiro = self.agente.executar_teste_pulo('direita', 15)
+
+        self.agente.definir_estado_inicial(self.start_lvl, self.start_x, self.start_y)
+        segundo = self.agente.executar_teste_pulo('direita', 15)
+
+        self.assertEqual(primeiro, segundo)
+        self.assertEqual(len(self.agente._cache), 1)
+
+    def test_pulo_em_cache_deixa_rei_no_pouso(self):
+        """
+        Test that a cache hit leaves the game in the state the simulated jump ended in.
+        """
+        self.agente.definir_estado_inicial(self.start_lvl, self.start_x, self.start_y)
+        self.agente.executar_teste_pulo('direita', 15)
+        pouso = self.agente.tester.state_key()
+
+        self.agente.definir_estado_inicial(self.start_lvl, self.start_x, self.start_y)
+        self.agente.executar_teste_pulo('direita', 15)
+
+        self.assertEqual(len(self.agente._cache), 1)
+        self.assertEqual(self.agente.tester.state_key(), pouso)
+
+    def test_cache_considera_movimento_do_rei(self):
+        """
+        Test that the same position with the King already moving is not a cache hit.
+        """
+        self.agente.definir_estado_inicial(self.start_lvl, self.start_x, self.start_y)
+        self.agente.executar_teste_pulo('direita', 15)
+
+        self.agente.definir_estado_inicial(self.start_lvl, self.start_x, self.start_y)
+        self.agente.tester.game.king.isFalling = True
+        self.agente.executar_teste_pulo('direita', 15)
+
+        self.assertEqual(len(self.agente._cache), 2)
+
+    def test_cache_considera_rei_estatelado(self):
+        """
+        Test that a splatted King at the cached position is simulated, not a cache hit.
+        """
+        self.agente.definir_estado_inicial(self.start_lvl, self.start_x, self.start_y)
+        self.agente.executar_teste_pulo('direita', 15)
+
+        self.agente.definir_estado_inicial(self.start_lvl, self.start_x, self.start_y)
+        self.agente.tester.game.king.isSplat = True
+        estado = self.agente.capturar_estado()
+        estatelado = self.agente.executar_teste_pulo('direita', 15)
+
+        self.assertEqual(len(self.agente._cache), 2)
+
+        # O resultado guardado é o da simulação a partir do rei estatelado
+        self.agente.restaurar_estado(estado)
+        self.assertEqual(self.agente.executar_teste_pulo('direita', 15, usar_cache=False), estatelado)
+
+    def test_voo_termina_abaixo_da_tela(self):
+        """
+        Test that the flight stops as soon as the King falls below the screen.
+        """
+        king = SimpleNamespace(x=100.0, y=300.0, isFalling=True, isJump=False, speed=5, isLanded=False)
+        voo_terminou = _criterio_fim_voo(king)
+
+        king.y = Y_MAXIMO
+        self.assertFalse(voo_terminou(king))
+        king.y = Y_MAXIMO + 1
+        self.assertTrue(voo_terminou(king))
+
+    def test_voo_termina_com_rei_parado(self):
+        """
+        Test that the flight stops after QUADROS_PARADO frames without movement.
+        """
+        king = SimpleNamespace(x=100.0, y=300.0, isFalling=True, isJump=False, speed=5, isLanded=False)
+        voo_terminou = _criterio_fim_voo(king)
+
+        # Movendo-se: nunca para
+        for _ in range(3 * QUADROS_PARADO):
+            king.x += 1
+            self.assertFalse(voo_terminou(king))
+
+        # Parado: para exatamente no QUADROS_PARADO-ésimo quadro sem movimento
+        paradas = [voo_terminou(king) for _ in range(QUADROS_PARADO)]
+        self.assertEqual(paradas, [False] * (QUADROS_PARADO - 1) + [True])
+
+    def test_parada_antecipada_mantem_pouso(self):
+        """
+        Test that walking into a wall stops early with the same landing as the
+        original landing-only criterion.
+        """
+        tester = self.agente.tester
+        self.agente.definir_estado_inicial(self.start_lvl, self.start_x, self.start_y)
+        estado = self.agente.capturar_estado()
+
+        quadros = []
+        step_until = tester.step_until
+
+        def step_until_contado(*args, **kwargs):
+            quadros.append(step_until(*args, **kwargs))
+            return quadros[-1]
+
+        with mock.patch.object(tester, 'step_until', side_effect=step_until_contado):
+            resultado = self.agente.executar_teste_pulo('esquerda', 0, usar_cache=False)
+
+        # Mesmo salto, esperando só pelo critério de pouso original
+        self.agente.restaurar_estado(estado)
+        quadros_original = tester.step_until(_pousou, max_frames=LIMITE_ESPERA, action=1)
+        original = (tester.get_current_level(), *tester.get_player_position(as_int=True))
+
+        self.assertLess(quadros[0], LIMITE_ESPERA)
+        self.assertLessEqual(quadros[0], quadros_original)
+        self.assertEqual(resultado, original)
+
+    def test_agentes_compartilham_tester(self):
+        """
+        Test that agents with the same configuration reuse one GameTester.
+        """
+        outro = AgenteTeste()
+        self.assertIs(outro.tester, self.agente.tester)
+
+    def test_encerrar_nao_finaliza_tester_de_outros_agentes(self):
+        """
+        Test that closing one agent keeps the shared game alive for the others.
+        """
+        outro = AgenteTeste()
+        outro.encerrar()
+        outro.encerrar()
+
+        self.assertTrue(self.agente.tester._initialized)
+        self.agente.definir_estado_inicial(self.start_lvl, self.start_x, self.start_y)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -9,6 +9,7 @@ import sys
 import os
 import pytest
 import math
+import pygame
 
 # Add the tests directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
@@ -35,6 +36,27 @@ class TestGameTesterInitialization:
         assert os.environ.get("fps") == "30"
         tester.shutdown()
     
+    def test_gametester_headless_uses_dummy_drivers(self):
+        """Test that headless mode selects the dummy video and audio drivers"""
+        with GameTester(headless=True):
+            assert os.environ.get("SDL_VIDEODRIVER") == "dummy"
+            assert os.environ.get("SDL_AUDIODRIVER") == "dummy"
+    
+    def test_gametester_does_not_pump_events_by_default(self):
+        """Test that OS events are only pumped when requested"""
+        with GameTester(headless=True) as tester:
+            assert tester.pump_events is False
+    
+    def test_gametester_records_video_driver(self):
+        """Test that the video driver chosen by SDL is recorded"""
+        with GameTester(headless=True) as tester:
+            assert tester.video_driver == "dummy"
+    
+    def test_gametester_headless_uses_tiny_screen(self):
+        """Test that headless mode replaces the display surface with a 1x1 surface"""
+        with GameTester(headless=True) as tester:
+            assert tester.game.screen.get_size() == (1, 1)
+    
     def test_gametester_context_manager(self):
         """Test that GameTester works as a context manager"""
         with GameTester(headless=True) as tester:
@@ -43,6 +65,11 @@ class TestGameTesterInitialization:
         # After exiting context, should be shut down
         assert tester._initialized is False
         assert tester.game is None
+    
+    def test_gametester_invalid_render_every_n(self):
+        """Test that render_every_n below 1 raises ValueError"""
+        with pytest.raises(ValueError, match="Invalid render_every_n"):
+            GameTester(headless=True, render_every_n=0)
 
 
 class TestPlayerPositioning:
@@ -201,11 +228,131 @@ class TestUnifiedSetup:
             assert abs(y - 200.0) < 0.1
             assert abs(tester.get_wind_state() - math.pi) < 0.001
     
+    def test_setup_without_validation(self):
+        """Test that setup with validate=False still applies all parameters"""
+        with GameTester(headless=True) as tester:
+            tester.setup(level=10, player_x=100.0, player_y=200.0,
+                         wind_phase=math.pi, validate=False)
+            assert tester.get_current_level() == 10
+            x, y = tester.get_player_position()
+            assert abs(x - 100.0) < 0.1
+            assert abs(y - 200.0) < 0.1
+            assert abs(tester.get_wind_state() - math.pi) < 0.001
+            assert tester.game.king.speed == 0
+    
     def test_setup_verifies_playable_state(self):
         """Test that setup verifies game is in playable state"""
         with GameTester(headless=True) as tester:
             tester.setup()
             assert tester.is_playable() is True
+    
+    def test_reset_state_restores_defaults(self):
+        """Test that reset_state unpauses and returns to the default setup"""
+        with GameTester(headless=True) as tester:
+            tester.setup(level=10, player_x=100.0, player_y=200.0, wind_phase=math.pi)
+            tester.set_paused(True)
+            tester.reset_state()
+            assert tester.get_current_level() == 0
+            x, y = tester.get_player_position()
+            assert abs(x - 230.0) < 0.1
+            assert abs(y - 298.0) < 0.1
+            assert abs(tester.get_wind_state() - 0.0) < 0.001
+            assert tester.is_playable() is True
+    
+    def test_reset_state_with_custom_parameters(self):
+        """Test reset_state with explicit level, position and wind"""
+        with GameTester(headless=True) as tester:
+            tester.reset_state(level=5, player_pos=(150.0, 250.0), wind_phase=math.pi / 2)
+            assert tester.get_current_level() == 5
+            x, y = tester.get_player_position()
+            assert abs(x - 150.0) < 0.1
+            assert abs(y - 250.0) < 0.1
+            assert abs(tester.get_wind_state() - math.pi / 2) < 0.001
+
+
+class TestSnapshotRestore:
+    """Tests for state snapshot and restore"""
+    
+    def test_restore_returns_to_snapshot(self):
+        """Test that restore brings back position, level and wind"""
+        with GameTester(headless=True) as tester:
+            tester.setup(level=3, player_x=120.0, player_y=200.0, wind_phase=math.pi / 2)
+            snap = tester.snapshot()
+            
+            tester.setup(level=7, player_x=300.0, player_y=100.0, wind_phase=math.pi)
+            tester.restore(snap)
+            
+            assert tester.get_current_level() == 3
+            x, y = tester.get_player_position()
+            assert abs(x - 120.0) < 0.1
+            assert abs(y - 200.0) < 0.1
+            assert abs(tester.get_wind_state() - math.pi / 2) < 0.001
+    
+    def test_restore_after_stepping(self):
+        """Test that restore undoes frames advanced after the snapshot"""
+        with GameTester(headless=True) as tester:
+            tester.setup()
+            snap = tester.snapshot()
+            tester.step(frames=10, action=2)
+            tester.restore(snap)
+            x, y = tester.get_player_position()
+            assert abs(x - 230.0) < 0.1
+            assert abs(y - 298.0) < 0.1
+            assert tester.game.king.speed == 0
+    
+    def test_jump_after_restore_matches_jump_after_setup(self):
+        """Test that jumping from a restored snapshot gives the same result as from setup"""
+        def jump(tester):
+            tester.step(frames=15, action=2)
+            tester.step(frames=120, action=0)
+            king = tester.game.king
+            return (
+                tester.get_current_level(),
+                tester.get_player_position(),
+                king.speed,
+                king.angle,
+                king.isFalling,
+                king.isJump,
+            )
+        
+        with GameTester(headless=True) as tester:
+            tester.setup()
+            after_setup = jump(tester)
+            
+            tester.setup()
+            snap = tester.snapshot()
+            tester.step(frames=30, action=3)
+            tester.restore(snap)
+            after_restore = jump(tester)
+            
+            # The snapshot must survive a restore and a jump unchanged
+            tester.restore(snap)
+            after_second_restore = jump(tester)
+            
+            assert after_restore == after_setup
+            assert after_second_restore == after_setup
+    
+    def test_state_key_tracks_full_king_state(self):
+        """Test that state_key matches after restore and changes with any King attribute"""
+        with GameTester(headless=True) as tester:
+            tester.setup()
+            key = tester.state_key()
+            snap = tester.snapshot()
+            
+            tester.step(frames=10, action=2)
+            assert tester.state_key() != key
+            tester.restore(snap)
+            assert tester.state_key() == key
+            
+            tester.game.king.isSplat = True
+            assert tester.state_key() != key
+    
+    def test_snapshot_not_initialized(self):
+        """Test that snapshot raises error when not initialized"""
+        tester = GameTester(headless=True)
+        tester.shutdown()
+        with pytest.raises(RuntimeError, match="not initialized"):
+            tester.snapshot()
 
 
 class TestStateInspection:
@@ -221,6 +368,15 @@ class TestStateInspection:
             assert abs(x - 150.0) < 0.1
             assert abs(y - 250.0) < 0.1
     
+    def test_get_player_position_as_int(self):
+        """Test getting player position rounded to integer pixels"""
+        with GameTester(headless=True) as tester:
+            tester.set_player_position(150.4, 250.6)
+            x, y = tester.get_player_position(as_int=True)
+            assert isinstance(x, int)
+            assert isinstance(y, int)
+            assert (x, y) == (150, 251)
+    
     def test_get_current_level(self):
         """Test getting current level"""
         with GameTester(headless=True) as tester:
@@ -306,6 +462,19 @@ class TestGameStepping:
             # After step, pause should be restored to original state
             assert os.environ.get("pause") == original_pause
     
+    def test_set_paused_freezes_simulation(self):
+        """Test that set_paused stops the game logic from advancing"""
+        with GameTester(headless=True) as tester:
+            tester.setup()
+            tester.set_paused(True)
+            assert os.environ.get("pause") == "1"
+            assert tester.is_playable() is False
+            tester.step(frames=10, action=0)
+            x, y = tester.get_player_position()
+            assert abs(x - 230.0) < 0.1
+            tester.set_paused(False)
+            assert os.environ.get("pause") == ""
+    
     def test_step_default_frames(self):
         """Test that step defaults to 1 frame"""
         with GameTester(headless=True) as tester:
@@ -313,6 +482,128 @@ class TestGameStepping:
             # Should not raise
             tester.step()
     
+    def test_step_headless_skips_rendering(self):
+        """Test that stepping in headless mode never draws a frame"""
+        with GameTester(headless=True) as tester:
+            tester.setup()
+            rendered = []
+            tester._render = lambda: rendered.append(True)
+            tester.step(frames=5)
+            assert rendered == []
+    
+    def test_step_render_override(self):
+        """Test that render=True draws once per call even in headless mode"""
+        with GameTester(headless=True) as tester:
+            tester.setup()
+            rendered = []
+            tester._render = lambda: rendered.append(True)
+            tester.step(frames=5, render=False)
+            assert rendered == []
+            tester.step(frames=5, render=True)
+            assert rendered == [True]
+    
+    def test_step_until_stops_when_predicate_holds(self):
+        """Test that step_until returns as soon as the predicate is true"""
+        with GameTester(headless=True) as tester:
+            tester.setup()
+            frames = tester.step_until(lambda king: True, max_frames=10)
+            assert frames == 1
+    
+    def test_step_until_respects_max_frames(self):
+        """Test that step_until gives up after max_frames"""
+        with GameTester(headless=True) as tester:
+            tester.setup()
+            frames = tester.step_until(lambda king: False, max_frames=10)
+            assert frames == 10
+    
+    def test_step_until_not_initialized(self):
+        """Test that step_until raises error when not initialized"""
+        tester = GameTester(headless=True)
+        tester.shutdown()
+        with pytest.raises(RuntimeError, match="not initialized"):
+            tester.step_until(lambda king: True, max_frames=1)
+    
+    def test_hold_does_not_advance_simulation(self, monkeypatch):
+        """Test that hold draws and waits without running any game logic"""
+        with GameTester(headless=True) as tester:
+            tester.setup(player_x=100.0, player_y=100.0)
+            # Take the windowed path, still on the dummy video driver
+            monkeypatch.setattr(tester, "headless", False)
+            updates = []
+            monkeypatch.setattr(
+                tester.game, "_update_gamestuff", lambda *args, **kwargs: updates.append(True)
+            )
+            rendered = []
+            render = tester._render
+            monkeypatch.setattr(tester, "_render", lambda: rendered.append(True) or render())
+            waited = []
+            wait = tester._wait
+            monkeypatch.setattr(tester, "_wait", lambda frames: waited.append(frames) or wait(frames))
+            
+            tester.hold(3)
+            
+            assert updates == []
+            assert rendered == [True]
+            assert waited == [3]
+            x, y = tester.get_player_position()
+            assert abs(x - 100.0) < 0.1
+            assert abs(y - 100.0) < 0.1
+    
+    def test_hold_not_initialized(self):
+        """Test that hold raises error when not initialized"""
+        tester = GameTester(headless=True)
+        tester.shutdown()
+        with pytest.raises(RuntimeError, match="not initialized"):
+            tester.hold(1)
+    
+    def test_render_states_leaves_last_state(self):
+        """Test that render_states applies every state and ends on the last one"""
+        with GameTester(headless=True) as tester:
+            tester.render_states([
+                {"level": 3},
+                {"level": 7, "player_pos": (120.0, 200.0), "wind_phase": math.pi},
+            ])
+            assert tester.get_current_level() == 7
+            x, y = tester.get_player_position()
+            assert abs(x - 120.0) < 0.1
+            assert abs(y - 200.0) < 0.1
+            assert abs(tester.get_wind_state() - math.pi) < 0.001
+    
+    def test_render_states_draws_each_state_into_a_tile(self, monkeypatch):
+        """Test that render_states draws every state into its own tile of the window"""
+        with GameTester(headless=True) as tester:
+            # Take the windowed path, still on the dummy video driver
+            monkeypatch.setattr(tester, "headless", False)
+            screen = tester.game.screen
+            width, height = pygame.display.get_surface().get_size()
+            tile_width, tile_height = width // 2, height // 2
+            
+            drawn = []
+            draw = tester.game._update_gamescreen
+            def draw_tile():
+                target = tester.game.screen
+                drawn.append((target.get_size(), target.get_offset(), tester.get_current_level()))
+                draw()
+            monkeypatch.setattr(tester.game, "_update_gamescreen", draw_tile)
+            
+            tester.render_states([{"level": level} for level in (0, 10, 20, 30)], frames=0)
+            
+            size = (tile_width, tile_height)
+            assert drawn == [
+                (size, (0, 0), 0),
+                (size, (tile_width, 0), 10),
+                (size, (0, tile_height), 20),
+                (size, (tile_width, tile_height), 30),
+            ]
+            assert tester.game.screen is screen
+            assert tester.get_current_level() == 30
+    
+    def test_render_states_too_many_states(self):
+        """Test that render_states rejects more states than tiles"""
+        with GameTester(headless=True) as tester:
+            with pytest.raises(ValueError, match="Too many states"):
+                tester.render_states([{}] * 5, tile=(2, 2))
+    
     def test_step_not_initialized(self):
         """Test that step raises error when not initialized"""
         tester = GameTester(headless=True)
@@ -324,6 +615,24 @@ class TestGameStepping:
 class TestResourceCleanup:
     """Tests for resource cleanup"""
     
+    def test_log_is_buffered_until_flush(self, capsys):
+        """Test that log messages are only written when flushed"""
+        with GameTester(headless=True) as tester:
+            capsys.readouterr()
+            tester.log("first")
+            tester.log("second")
+            assert capsys.readouterr().out == ""
+            tester.flush_log()
+            assert capsys.readouterr().out == "first\nsecond\n"
+    
+    def test_shutdown_flushes_log(self, capsys):
+        """Test that shutdown writes out pending log messages"""
+        tester = GameTester(headless=True)
+        capsys.readouterr()
+        tester.log("pending")
+        tester.shutdown()
+        assert capsys.readouterr().out == "pending\n"
+    
     def test_shutdown_cleans_up_resources(self):
         """Test that shutdown properly cleans up resources"""
         tester = GameTester(headless=True)
@@ -1,5 +1,9 @@
+import os
+import tempfile
 import unittest
-from .ExploradorPlataforma import ExploradorPlataforma
+from unittest import mock
+
+from .ExploradorPlataforma import ExploradorPlataforma, resultados_para_array, _versao_simulador
 
 class TestMapeamento(unittest.TestCase):
     
@@ -52,5 +56,139 @@ class TestMapeamento(unittest.TestCase):
         # Valida se o valor tem 3 elementos (nivel, x, y)
         self.assertEqual(len(valor_exemplo), 3)
 
+    def test_mapeamento_repetido_usa_cache(self):
+        """
+        Testa se mapear a mesma plataforma de novo devolve o resultado guardado.
+        """
+        # Plataforma estreita (3 pontos de teste) para manter o teste rápido
+        nivel = 0
+        plataforma = (352, 185, 2, 175, 0, 0, False, False)
+
+        # Explorador novo (mesmo jogo compartilhado), sem mapeamentos guardados
+        with ExploradorPlataforma(headless=False) as explorador:
+            with mock.patch.object(explorador, '_mapear', wraps=explorador._mapear) as mapear:
+                primeiro = explorador.mapear_plataforma(nivel, plataforma)
+                segundo = explorador.mapear_plataforma(nivel, plataforma)
+
+            self.assertEqual(mapear.call_count, 1)
+            self.assertEqual(primeiro, segundo)
+            self.assertIn((nivel, plataforma), explorador._mapeamentos)
+
+    def test_cache_em_disco(self):
+        """
+        Testa se um mapeamento salvo em disco é reaproveitado por outro explorador.
+        """
+        nivel = 0
+        plataforma = (352, 185, 2, 175, 0, 0, False, False)
+        resultados = self.explorador.mapear_plataforma(nivel, plataforma)
+
+        with tempfile.TemporaryDirectory() as pasta:
+            with ExploradorPlataforma(headless=False, diretorio_cache=pasta) as explorador:
+                with mock.patch.object(explorador, '_mapear', return_value=resultados):
+                    explorador.mapear_plataforma(nivel, plataforma)
+
+            # Um único .pkl, numa subpasta com a versão do simulador, sem temporários
+            self.assertEqual(os.listdir(pasta), [_versao_simulador()])
+            arquivos = os.listdir(os.path.join(pasta, _versao_simulador()))
+            self.assertEqual(len(arquivos), 1)
+            self.assertTrue(arquivos[0].endswith('.pkl'))
+
+            with ExploradorPlataforma(headless=False, diretorio_cache=pasta) as explorador:
+                with mock.patch.object(explorador, '_mapear') as mapear:
+                    lido = explorador.mapear_plataforma(nivel, plataforma)
+
+            mapear.assert_not_called()
+            self.assertEqual(lido, resultados)
+
+    def test_cache_em_disco_invalidado_por_nova_versao(self):
+        """
+        Testa se uma mudança no simulador faz o mapeamento ser refeito.
+        """
+        nivel = 0
+        plataforma = (352, 185, 2, 175, 0, 0, False, False)
+        resultados = self.explorador.mapear_plataforma(nivel, plataforma)
+
+        with tempfile.TemporaryDirectory() as pasta:
+            with ExploradorPlataforma(headless=False, diretorio_cache=pasta) as explorador:
+                with mock.patch.object(explorador, '_mapear', return_value=resultados):
+                    explorador.mapear_plataforma(nivel, plataforma)
+
+            with ExploradorPlataforma(headless=False, diretorio_cache=pasta) as explorador:
+                with mock.patch(f'{ExploradorPlataforma.__module__}._versao_simulador', return_value='outra'), \
+                        mock.patch.object(explorador, '_mapear', return_value=resultados) as mapear:
+                    explorador.mapear_plataforma(nivel, plataforma)
+
+            self.assertEqual(mapear.call_count, 1)
+
+    def test_versao_simulador_estavel(self):
+        """
+        Testa se a versão do simulador não muda sem alteração nos fontes.
+        """
+        self.assertEqual(_versao_simulador(), _versao_simulador())
+        self.assertEqual(len(_versao_simulador()), 12)
+
+    def test_mapeamento_paralelo_igual_ao_sequencial(self):
+        """
+        Testa se dividir a varredura entre processos dá o mesmo resultado.
+        """
+        nivel = 0
+        plataforma = (352, 185, 2, 175, 0, 0, False, False)
+
+        sequencial = self.explorador.mapear_plataforma(nivel, plataforma)
+        with ExploradorPlataforma(headless=False, processos=2) as paralelo:
+            resultado_paralelo = paralelo.mapear_plataforma(nivel, plataforma)
+
+        self.assertEqual(resultado_paralelo, sequencial)
+        # Mesma ordem de inserção da varredura sequencial
+        self.assertEqual(list(resultado_paralelo), list(sequencial))
+
+    def test_processos_none_usa_todos_os_nucleos(self):
+        """
+        Testa se processos=None usa um trabalhador por núcleo.
+        """
+        with ExploradorPlataforma(headless=False, processos=None) as explorador:
+            self.assertEqual(explorador.processos, os.cpu_count() or 1)
+
+    def test_mapear_plataformas(self):
+        """
+        Testa o mapeamento de várias plataformas de uma vez.
+        """
+        nivel = 0
+        plataformas = [
+            (nivel, (352, 185, 2, 175, 0, 0, False, False)),
+            (nivel, (420, 185, 2, 175, 0, 0, False, False)),
+        ]
+
+        resultados = self.explorador.mapear_plataformas(plataformas)
+
+        self.assertEqual(list(resultados), plataformas)
+        for (nivel_id, params), resultado in resultados.items():
+            self.assertEqual(resultado, self.explorador.mapear_plataforma(nivel_id, params))
+
+    def test_contexto_nao_finaliza_jogo_compartilhado(self):
+        """
+        Testa se sair de um bloco with de outro explorador mantém o jogo compartilhado.
+        """
+        with ExploradorPlataforma(headless=False) as outro:
+            self.assertIs(outro.agente.tester, self.explorador.agente.tester)
+
+        self.assertTrue(self.explorador.agente.tester._initialized)
+
+    def test_resultados_para_array(self):
+        """
+        Testa a conversão do dicionário de resultados para array estruturado.
+        """
+        resultados = {
+            (352, 0, 'direita'): (0, 360, 154),
+            (352, 0, 'esquerda'): (0, 344, 154),
+            (400, 35, 'direita'): (1, 420, 300),
+        }
+
+        arr = resultados_para_array(resultados)
+
+        self.assertEqual(len(arr), 3)
+        self.assertEqual(list(arr['direcao']), [1, -1, 1])
+        self.assertEqual(tuple(arr[2]), (400, 35, 1, 1, 420, 300))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file